@@ -0,0 +1,18 @@
+from typing import Optional
+
+from fastapi import HTTPException, Query
+
+from app.services.model import get_model_service
+
+
+def region_param(
+    region: Optional[str] = Query(
+        default=None,
+        description="Región del modelo (ej: la1, na1). Por defecto RIOT_REGION.",
+    ),
+) -> str:
+    """Valida el parámetro ?region= y devuelve la región normalizada (400 si es inválida)."""
+    try:
+        return get_model_service().normalize_region(region)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
@@ -1,16 +1,21 @@
 from typing import List
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from fastapi.concurrency import run_in_threadpool
 from pydantic import BaseModel, Field
 
-from app.services.model import WinrateModelService
+from app.api.v1.deps import region_param
+from app.services.features import PACKED_DTYPE, PACKED_WIDTH, parse_packed_selections
+from app.services.model import get_model_service
+
+BULK_MEDIA_TYPE = "application/octet-stream"
 
 router = APIRouter(
     prefix="/api/v1",
     tags=["predictions"],
 )
 
-model_service = WinrateModelService()
+model_service = get_model_service()
 
 
 class TeamSelection(BaseModel):
@@ -26,14 +31,104 @@ class PredictionResponse(BaseModel):
     winrate: float
 
 
+class RegionModelStats(BaseModel):
+    """Estado de una región en el registro de modelos."""
+
+    region: str
+    loaded: bool
+    load_count: int
+    memory_bytes: int
+    stats_loaded: bool
+    stats_memory_bytes: int
+
+
+def _load_region(region: str) -> None:
+    """Carga el modelo de la región (si hace falta) o responde 404."""
+    try:
+        model_service.get_region(region)
+    except FileNotFoundError as exc:
+        raise HTTPException(status_code=404, detail=str(exc))
+
+
 @router.post("/predict", response_model=PredictionResponse)
-def predict(selection: TeamSelection) -> PredictionResponse:
+def predict(
+    selection: TeamSelection,
+    region: str = Depends(region_param),
+) -> PredictionResponse:
+    _load_region(region)
     try:
         winrate = model_service.predict_winrate(
             team_champions=selection.team_champions,
             enemy_champions=selection.enemy_champions,
+            region=region,
         )
     except Exception as exc:
         raise HTTPException(status_code=500, detail=str(exc))
 
     return PredictionResponse(winrate=winrate)
+
+
+async def _read_bulk_body(request: Request) -> bytearray:
+    """Lee el cuerpo binario cortando en cuanto supera MAX_BULK_ROWS filas."""
+    max_rows = model_service.settings.max_bulk_rows
+    max_bytes = max_rows * PACKED_DTYPE.itemsize * PACKED_WIDTH
+    too_large = HTTPException(
+        status_code=413,
+        detail=f"Máximo {max_rows} filas por petición.",
+    )
+
+    content_length = request.headers.get("content-length")
+    if content_length is not None and content_length.isdigit():
+        if int(content_length) > max_bytes:
+            raise too_large
+
+    body = bytearray()
+    async for chunk in request.stream():
+        body.extend(chunk)
+        if len(body) > max_bytes:
+            raise too_large
+
+    return body
+
+
+@router.post("/predict/bulk", response_class=Response)
+async def predict_bulk(
+    request: Request,
+    region: str = Depends(region_param),
+) -> Response:
+    """Predicción masiva en formato binario.
+
+    Entrada: matriz (N, 10) de int16 little-endian, 0 = hueco vacío.
+    Salida: N probabilidades float32 little-endian, en el mismo orden.
+    """
+    content_type = request.headers.get("content-type", "").split(";")[0].strip()
+    if content_type != BULK_MEDIA_TYPE:
+        raise HTTPException(
+            status_code=415,
+            detail=f"Se esperaba Content-Type: {BULK_MEDIA_TYPE}",
+        )
+
+    body = await _read_bulk_body(request)
+    try:
+        champions = parse_packed_selections(body)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+
+    await run_in_threadpool(_load_region, region)
+    try:
+        proba = await run_in_threadpool(
+            model_service.predict_winrate_batch, champions, region
+        )
+    except Exception as exc:
+        raise HTTPException(status_code=500, detail=str(exc))
+
+    return Response(
+        content=proba.astype("<f4", copy=False).tobytes(),
+        media_type=BULK_MEDIA_TYPE,
+    )
+
+
+@router.get("/models", response_model=List[RegionModelStats])
+def get_models() -> List[RegionModelStats]:
+    """Regiones cargadas, número de cargas y memoria aproximada de cada una."""
+    return [RegionModelStats(**entry) for entry in model_service.registry_stats()]
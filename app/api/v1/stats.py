@@ -1,9 +1,11 @@
-from typing import List
+from typing import List, Optional
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from pydantic import BaseModel
 import pandas as pd
-from pathlib import Path
+
+from app.api.v1.deps import region_param
+from app.services.model import get_model_service
 
 router = APIRouter(
     prefix="/api/v1/stats",
@@ -18,10 +20,39 @@ class ChampionStats(BaseModel):
     winrate: float
 
 
+class CompositionEstimate(BaseModel):
+    champions: List[int]
+    games: int
+    wins: int
+    winrate: Optional[float]
+    reliable: bool
+
+
+class CompositionErrorBound(BaseModel):
+    """Sobreestimación máxima de `games` del equipo con probabilidad 1 - delta.
+
+    Los tríos se cuentan de forma exacta y no tienen error.
+    """
+
+    team_games: float
+    delta: float
+
+
+class CompositionStatsResponse(BaseModel):
+    trios: List[CompositionEstimate]
+    team: Optional[CompositionEstimate]
+    error_bound: CompositionErrorBound
+
+
 @router.get("/champions", response_model=List[ChampionStats])
-def get_champion_stats() -> List[ChampionStats]:
+def get_champion_stats(region: str = Depends(region_param)) -> List[ChampionStats]:
     """Devuelve estadísticas de partidas por campeón."""
-    stats_path = Path("data/processed/stats_per_champion.csv")
+    try:
+        stats_dir = get_model_service().stats_dir(region)
+    except FileNotFoundError as exc:
+        raise HTTPException(status_code=404, detail=str(exc))
+
+    stats_path = stats_dir / "stats_per_champion.csv"
     if not stats_path.exists():
         raise HTTPException(
             status_code=500,
@@ -45,3 +76,24 @@ def get_champion_stats() -> List[ChampionStats]:
     ]
 
     return result
+
+
+@router.get("/compositions", response_model=CompositionStatsResponse)
+def get_composition_stats(
+    champions: List[int] = Query(..., min_length=1, max_length=5),
+    region: str = Depends(region_param),
+) -> CompositionStatsResponse:
+    """Estadísticas de los tríos y del equipo completo del draft."""
+    try:
+        entry = get_model_service().get_stats(region)
+    except FileNotFoundError as exc:
+        raise HTTPException(status_code=404, detail=str(exc))
+
+    if entry.compositions is None:
+        raise HTTPException(
+            status_code=404,
+            detail="No se encontraron estadísticas de composiciones. "
+            "Ejecuta primero: poetry run python -m scripts.train_model",
+        )
+
+    return CompositionStatsResponse(**entry.compositions.query_team(champions))
@@ -1,4 +1,5 @@
 from functools import lru_cache
+from pathlib import Path
 from typing import Optional
 
 from pydantic import Field
@@ -18,10 +19,38 @@ class Settings(BaseSettings):
         default="models/winrate_model.pkl",
         env="MODEL_PATH",
     )
+    # Registro multi-región: {region} se reemplaza por el código de región.
+    # Si la ruta por región no existe, la región por defecto usa model_path.
+    region_model_path: str = Field(
+        default="models/{region}/winrate_model.pkl",
+        env="REGION_MODEL_PATH",
+    )
+    region_stats_dir: str = Field(
+        default="data/processed/{region}",
+        env="REGION_STATS_DIR",
+    )
+    max_loaded_models: int = Field(
+        default=3,
+        env="MAX_LOADED_MODELS",
+    )
+    # Límite de filas por petición en /api/v1/predict/bulk
+    max_bulk_rows: int = Field(
+        default=100_000,
+        env="MAX_BULK_ROWS",
+    )
     log_level: str = Field(
         default="info",
         env="LOG_LEVEL",
     )
+    # Perfilado de scripts (ver scripts/profiling.py)
+    profile: bool = Field(
+        default=False,
+        env="PROFILE",
+    )
+    profile_stage: Optional[str] = Field(
+        default=None,
+        env="PROFILE_STAGE",
+    )
 
     # Configuración para leer el archivo .env
     model_config = SettingsConfigDict(
@@ -29,6 +58,18 @@ class Settings(BaseSettings):
         env_file_encoding="utf-8",
     )
 
+    def model_path_for(self, region: Optional[str] = None) -> Path:
+        """Ruta del modelo de la región (o MODEL_PATH si no se indica región)."""
+        if region is None:
+            return Path(self.model_path)
+        return Path(self.region_model_path.format(region=region))
+
+    def stats_dir_for(self, region: Optional[str] = None) -> Path:
+        """Carpeta de estadísticas de la región (o data/processed si no se indica)."""
+        if region is None:
+            return Path("data/processed")
+        return Path(self.region_stats_dir.format(region=region))
+
 
 @lru_cache
 def get_settings() -> Settings:
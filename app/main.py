@@ -1,11 +1,12 @@
-import json
-from pathlib import Path
+from typing import Optional
+
 from fastapi import FastAPI, Request
+from fastapi.concurrency import run_in_threadpool
 from fastapi.responses import HTMLResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 
-from app.api.v1.predictions import router as predictions_router
+from app.api.v1.predictions import model_service, router as predictions_router
 from app.api.v1.stats import router as stats_router
 
 app = FastAPI(title="Can i win with these monkeys")
@@ -24,28 +25,19 @@ app.mount(
 #Templates
 templates = Jinja2Templates(directory="app/frontend/templates")
 
-def load_stats():
-    base_path = Path("data/processed")
-    counters = {}
-    runes = {}
-    
+def load_stats(region: Optional[str] = None):
     try:
-        if (base_path / "champion_counters.json").exists():
-            with open(base_path / "champion_counters.json", "r") as f:
-                counters = json.load(f)
-        
-        if (base_path / "champion_runes.json").exists():
-            with open(base_path / "champion_runes.json", "r") as f:
-                runes = json.load(f)
+        stats = model_service.get_stats(region)
     except Exception as e:
         print(f"Error cargando stats: {e}")
-    
-    return counters, runes
+        return {}, {}
+
+    return stats.counters, stats.runes
 
 @app.get("/", response_class=HTMLResponse)
-async def read_root(request: Request):
+async def read_root(request: Request, region: Optional[str] = None):
 
-    counters_data, runes_data = load_stats()
+    counters_data, runes_data = await run_in_threadpool(load_stats, region)
 
     return templates.TemplateResponse(
         "index.html",
@@ -57,9 +49,9 @@ async def read_root(request: Request):
         },
     )
 @app.get("/dashboard", response_class=HTMLResponse)
-async def dashboard(request: Request):
+async def dashboard(request: Request, region: Optional[str] = None):
 
-    counters_data, runes_data = load_stats()
+    counters_data, runes_data = await run_in_threadpool(load_stats, region)
 
     return templates.TemplateResponse(
         "dashboard.html",
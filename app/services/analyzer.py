@@ -1,5 +1,7 @@
 import pandas as pd
 
+from app.services.compositions import CompositionStats
+
 class ChampionAnalyzer:
     """
     Clase dedicada a extraer estadísticas descriptivas del DataFrame de partidas.
@@ -88,3 +90,21 @@ class ChampionAnalyzer:
             rune_stats[champ].sort(key=lambda x: x["games"], reverse=True)
             
         return rune_stats
+
+    def process_compositions(self, chunk_size: int = 50_000) -> CompositionStats:
+        """Acumula tríos (exactos) y equipos completos (sketch) con memoria fija.
+
+        Se recorre el DataFrame por bloques, como si las partidas llegaran en
+        streaming. Cada partida aporta el equipo aliado (gana si team_win = 1)
+        y el enemigo (gana si team_win = 0).
+        """
+        print("Calculando estadísticas de composiciones...")
+        stats = CompositionStats()
+
+        for start in range(0, len(self.df), chunk_size):
+            chunk = self.df.iloc[start:start + chunk_size]
+            team_win = chunk["team_win"].to_numpy()
+            stats.update(chunk[self.team_cols].to_numpy(), team_win)
+            stats.update(chunk[self.enemy_cols].to_numpy(), 1 - team_win)
+
+        return stats
@@ -0,0 +1,265 @@
+"""Estadísticas de tríos y composiciones completas con memoria acotada.
+
+Tríos: se cuentan de forma exacta. Cada campeón recibe un índice denso
+(0..max_champions-1) la primera vez que aparece, y cada trío ordenado
+a < b < c se guarda en la posición C(a,1) + C(b,2) + C(c,3) (sistema
+combinatorio de numeración). Con max_champions = 200 son C(200, 3) ≈ 1.3M
+posiciones x 2 contadores uint32 ≈ 10.5 MB.
+
+Equipos de 5: C(200, 5) ≈ 2.5e9 combinaciones no caben en un array, así que
+se usan count-min sketches de `depth x width` contadores. Cotas de error
+(Cormode & Muthukrishnan) para un sketch con N incrementos:
+- La estimación nunca es menor que el valor real.
+- Con probabilidad >= 1 - δ, estimación <= real + ε·N,
+  donde ε = e / width y δ = e^(-depth).
+
+Con los valores por defecto (width = 2^18, depth = 5): ε ≈ 1.04e-5 y
+δ ≈ 0.7%, en 2 x 5 x 2^18 x 4 bytes ≈ 10.5 MB. Casi todos los equipos
+completos son únicos, así que su conteo real suele ser de 1-2 partidas: si
+la estimación no supera ε·N se marca `reliable: false` y no se da winrate.
+"""
+
+from __future__ import annotations
+
+from itertools import combinations
+from math import comb
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from app.services.features import MAX_CHAMP_ID
+
+DEFAULT_MAX_CHAMPIONS = 200
+DEFAULT_WIDTH = 2**18
+DEFAULT_DEPTH = 5
+
+# Cada ID cabe en 10 bits (MAX_CHAMP_ID <= 1024), así un equipo de 5 cabe en 50 bits
+_ID_BITS = 10
+_TRIO_INDEXES = np.array(list(combinations(range(5), 3)))
+
+_GOLDEN = np.uint64(0x9E3779B97F4A7C15)
+_MIX1 = np.uint64(0xBF58476D1CE4E5B9)
+_MIX2 = np.uint64(0x94D049BB133111EB)
+
+
+def _splitmix64(x: np.ndarray) -> np.ndarray:
+    """Hash de 64 bits vectorizado (los desbordes de uint64 son intencionales)."""
+    z = x + _GOLDEN
+    z = (z ^ (z >> np.uint64(30))) * _MIX1
+    z = (z ^ (z >> np.uint64(27))) * _MIX2
+    return z ^ (z >> np.uint64(31))
+
+
+def encode_combinations(champions: np.ndarray) -> np.ndarray:
+    """Codifica cada fila de IDs (ya ordenada) en una sola clave uint64."""
+    champions = champions.astype(np.uint64)
+    shifts = np.arange(champions.shape[1], dtype=np.uint64) * np.uint64(_ID_BITS)
+    return np.bitwise_or.reduce(champions << shifts, axis=1)
+
+
+class CountMinSketch:
+    """Count-min sketch de contadores uint32 con `depth` funciones hash."""
+
+    def __init__(self, width: int = DEFAULT_WIDTH, depth: int = DEFAULT_DEPTH, seed: int = 0):
+        self.width = width
+        self.depth = depth
+        self.seed = seed
+        self.counts = np.zeros((depth, width), dtype=np.uint32)
+        self.total = 0
+
+        rng = np.random.default_rng(seed)
+        self._row_seeds = rng.integers(0, 2**63, size=(depth, 1), dtype=np.uint64)
+
+    @classmethod
+    def from_error_bounds(cls, epsilon: float, delta: float, seed: int = 0) -> CountMinSketch:
+        """Dimensiona el sketch para un error relativo ε con probabilidad 1 - δ."""
+        width = int(np.ceil(np.e / epsilon))
+        depth = int(np.ceil(np.log(1 / delta)))
+        return cls(width=width, depth=depth, seed=seed)
+
+    @property
+    def epsilon(self) -> float:
+        return float(np.e / self.width)
+
+    @property
+    def delta(self) -> float:
+        return float(np.exp(-self.depth))
+
+    @property
+    def error_bound(self) -> float:
+        """Sobreestimación máxima (con probabilidad 1 - δ) de cualquier consulta."""
+        return self.epsilon * self.total
+
+    def _indices(self, keys: np.ndarray) -> np.ndarray:
+        hashed = _splitmix64(keys.astype(np.uint64)[np.newaxis, :] ^ self._row_seeds)
+        return (hashed % np.uint64(self.width)).astype(np.intp)
+
+    def add(self, keys: np.ndarray, weights: Optional[np.ndarray] = None) -> None:
+        if len(keys) == 0:
+            return
+
+        indices = self._indices(keys)
+        for row in range(self.depth):
+            increments = np.bincount(indices[row], weights=weights, minlength=self.width)
+            self.counts[row] += increments.astype(np.uint32)
+
+        self.total += int(len(keys) if weights is None else np.sum(weights))
+
+    def query(self, keys: np.ndarray) -> np.ndarray:
+        indices = self._indices(keys)
+        return self.counts[np.arange(self.depth)[:, np.newaxis], indices].min(axis=0)
+
+
+class CompositionStats:
+    """Partidas y victorias por trío de aliados (exacto) y por equipo de 5 (sketch)."""
+
+    def __init__(
+        self,
+        max_champions: int = DEFAULT_MAX_CHAMPIONS,
+        width: int = DEFAULT_WIDTH,
+        depth: int = DEFAULT_DEPTH,
+        seed: int = 0,
+    ):
+        self.max_champions = max_champions
+        n_trios = comb(max_champions, 3)
+        self.trio_games = np.zeros(n_trios, dtype=np.uint32)
+        self.trio_wins = np.zeros(n_trios, dtype=np.uint32)
+        self.team_games = CountMinSketch(width, depth, seed)
+        self.team_wins = CountMinSketch(width, depth, seed)
+
+        # ID de campeón -> índice denso (-1 = aún no visto)
+        self._dense = np.full(MAX_CHAMP_ID, -1, dtype=np.int32)
+        self.champion_ids: List[int] = []
+
+    @property
+    def nbytes(self) -> int:
+        """Memoria ocupada por los contadores."""
+        return (
+            self.trio_games.nbytes
+            + self.trio_wins.nbytes
+            + self.team_games.counts.nbytes
+            + self.team_wins.counts.nbytes
+        )
+
+    def _register(self, champions: np.ndarray) -> None:
+        new_ids = np.unique(champions[self._dense[champions] < 0])
+        if len(self.champion_ids) + len(new_ids) > self.max_champions:
+            raise ValueError(
+                f"Hay más de {self.max_champions} campeones distintos; "
+                "aumenta max_champions."
+            )
+        start = len(self.champion_ids)
+        self._dense[new_ids] = np.arange(start, start + len(new_ids))
+        self.champion_ids.extend(int(c) for c in new_ids)
+
+    def update(self, teams: np.ndarray, wins: np.ndarray) -> None:
+        """Procesa un bloque de equipos (N, 5) con su resultado (N,) 1 = victoria."""
+        teams = np.asarray(teams)
+        wins = np.asarray(wins)
+
+        # Se descartan equipos con IDs fuera de 0 < id < MAX_CHAMP_ID o repetidos:
+        # un trío con IDs repetidos no cumple a < b < c y caería en el hueco de otro
+        in_range = ((teams > 0) & (teams < MAX_CHAMP_ID)).all(axis=1)
+        distinct = (np.diff(np.sort(teams, axis=1), axis=1) != 0).all(axis=1)
+        valid = in_range & distinct
+        teams, wins = teams[valid], wins[valid]
+        if len(teams) == 0:
+            return
+
+        self._register(teams)
+        dense = np.sort(self._dense[teams].astype(np.int64), axis=1)
+        trios = dense[:, _TRIO_INDEXES].reshape(-1, 3)
+        ranks = _trio_rank(trios[:, 0], trios[:, 1], trios[:, 2])
+        trio_wins = np.repeat(wins, len(_TRIO_INDEXES))
+        self.trio_games += np.bincount(ranks, minlength=len(self.trio_games)).astype(np.uint32)
+        self.trio_wins += np.bincount(
+            ranks, weights=trio_wins, minlength=len(self.trio_wins)
+        ).astype(np.uint32)
+
+        team_keys = encode_combinations(np.sort(teams, axis=1))
+        self.team_games.add(team_keys)
+        self.team_wins.add(team_keys, weights=wins.astype(np.float64))
+
+    def query_team(self, champions: List[int]) -> Dict[str, object]:
+        """Conteos de cada trío de la selección y, si hay 5, estimación del equipo."""
+        champions = sorted({c for c in champions if 0 < c < MAX_CHAMP_ID})
+        team_bound = self.team_games.error_bound
+        result: Dict[str, object] = {
+            "trios": [],
+            "team": None,
+            "error_bound": {
+                "team_games": round(team_bound, 2),
+                "delta": round(self.team_games.delta, 4),
+            },
+        }
+
+        if len(champions) >= 3:
+            for trio in combinations(champions, 3):
+                dense = np.sort(self._dense[list(trio)])
+                if dense[0] < 0:
+                    games = wins = 0
+                else:
+                    rank = _trio_rank(*dense.astype(np.int64))
+                    games, wins = int(self.trio_games[rank]), int(self.trio_wins[rank])
+                result["trios"].append(_estimate(list(trio), games, wins, reliable=True))
+
+        if len(champions) == 5:
+            key = encode_combinations(np.array([champions]))
+            games = int(self.team_games.query(key)[0])
+            wins = min(int(self.team_wins.query(key)[0]), games)
+            result["team"] = _estimate(champions, games, wins, reliable=games > team_bound)
+
+        return result
+
+    def save(self, path: Path) -> None:
+        np.savez_compressed(
+            path,
+            max_champions=self.max_champions,
+            width=self.team_games.width,
+            depth=self.team_games.depth,
+            seed=self.team_games.seed,
+            champion_ids=np.array(self.champion_ids, dtype=np.int32),
+            trio_games=self.trio_games,
+            trio_wins=self.trio_wins,
+            team_games_counts=self.team_games.counts,
+            team_games_total=self.team_games.total,
+            team_wins_counts=self.team_wins.counts,
+            team_wins_total=self.team_wins.total,
+        )
+
+    @classmethod
+    def load(cls, path: Path) -> CompositionStats:
+        with np.load(path) as data:
+            stats = cls(
+                int(data["max_champions"]),
+                int(data["width"]),
+                int(data["depth"]),
+                int(data["seed"]),
+            )
+            # Se respeta el orden guardado: define los índices densos
+            champion_ids = data["champion_ids"]
+            stats._dense[champion_ids] = np.arange(len(champion_ids))
+            stats.champion_ids = champion_ids.tolist()
+            stats.trio_games = data["trio_games"]
+            stats.trio_wins = data["trio_wins"]
+            for name, sketch in (("team_games", stats.team_games), ("team_wins", stats.team_wins)):
+                sketch.counts = data[f"{name}_counts"]
+                sketch.total = int(data[f"{name}_total"])
+        return stats
+
+
+def _trio_rank(a: np.ndarray, b: np.ndarray, c: np.ndarray) -> np.ndarray:
+    """Posición de cada trío ordenado a < b < c en el sistema combinatorio."""
+    return a + b * (b - 1) // 2 + c * (c - 1) * (c - 2) // 6
+
+
+def _estimate(champions: List[int], games: int, wins: int, reliable: bool) -> Dict[str, object]:
+    reliable = reliable and games > 0
+    return {
+        "champions": champions,
+        "games": games,
+        "wins": wins,
+        "winrate": round(wins / games * 100, 2) if reliable else None,
+        "reliable": reliable,
+    }
@@ -5,6 +5,12 @@ import numpy as np
 # Ponemos 1000 para tener margen de seguridad.
 MAX_CHAMP_ID = 1000 
 
+# Formato binario para predicciones masivas: int16 little-endian,
+# 10 columnas por fila (5 aliados + 5 enemigos), 0 = hueco vacío.
+PACKED_DTYPE = np.dtype("<i2")
+PACKED_WIDTH = 10
+TEAM_SIZE = PACKED_WIDTH // 2
+
 def selection_to_feature_vector(
     team_champions: List[int],
     enemy_champions: List[int],
@@ -30,4 +36,65 @@ def selection_to_feature_vector(
         if 0 < champ_id < MAX_CHAMP_ID:
             features[champ_id] = -1
 
-    return features
\ No newline at end of file
+    return features
+
+
+def parse_packed_selections(payload: bytes) -> np.ndarray:
+    """
+    Interpreta un cuerpo binario como matriz (N, 10) de IDs sin copiarlo.
+
+    Cada ID debe cumplir 0 < id < MAX_CHAMP_ID, salvo el 0 de relleno,
+    y cada equipo necesita al menos un campeón. Lanza ValueError si no.
+    """
+    row_bytes = PACKED_DTYPE.itemsize * PACKED_WIDTH
+    if not payload or len(payload) % row_bytes != 0:
+        raise ValueError(
+            f"El cuerpo debe contener filas de {row_bytes} bytes "
+            f"({PACKED_WIDTH} enteros int16 little-endian)."
+        )
+
+    champions = np.frombuffer(payload, dtype=PACKED_DTYPE).reshape(-1, PACKED_WIDTH)
+
+    # Validación vectorizada: un solo recorrido por toda la matriz
+    invalid = (champions < 0) | (champions >= MAX_CHAMP_ID)
+    if invalid.any():
+        bad_rows = np.flatnonzero(invalid.any(axis=1))
+        raise ValueError(
+            f"IDs fuera de rango (0 < id < {MAX_CHAMP_ID}) en las filas: "
+            f"{bad_rows[:10].tolist()}"
+        )
+
+    present = champions != 0
+    empty = ~present[:, :TEAM_SIZE].any(axis=1) | ~present[:, TEAM_SIZE:].any(axis=1)
+    if empty.any():
+        bad_rows = np.flatnonzero(empty)
+        raise ValueError(
+            f"Cada equipo necesita al menos un campeón. Filas vacías: "
+            f"{bad_rows[:10].tolist()}"
+        )
+
+    return champions
+
+
+def selections_to_feature_matrix(champions: np.ndarray) -> np.ndarray:
+    """
+    Versión vectorizada de selection_to_feature_vector para N partidas.
+
+    Recibe una matriz (N, 10) con [aliado1..aliado5, enemigo1..enemigo5]
+    y retorna una matriz (N, 1000) con la misma codificación +1 / -1 / 0.
+    Los IDs fuera de 0 < id < MAX_CHAMP_ID se ignoran, igual que en la
+    versión por fila.
+    """
+    champions = np.asarray(champions)
+    n_rows = champions.shape[0]
+    features = np.zeros((n_rows, MAX_CHAMP_ID), dtype=np.int8)
+    rows = np.repeat(np.arange(n_rows), TEAM_SIZE)
+
+    # Aliados primero y enemigos después, para respetar el mismo orden
+    # de sobrescritura que la versión por fila.
+    for side, value in ((champions[:, :TEAM_SIZE], 1), (champions[:, TEAM_SIZE:], -1)):
+        ids = side.ravel()
+        valid = (ids > 0) & (ids < MAX_CHAMP_ID)
+        features[rows[valid], ids[valid]] = value
+
+    return features
@@ -1,40 +1,251 @@
 from __future__ import annotations
 
+import json
 import os
-from typing import List
+import re
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 import numpy as np
 from joblib import load
 from sklearn.linear_model import LogisticRegression
 
-from app.core.config import get_settings
-from app.services.features import selection_to_feature_vector
+from app.core.config import Settings, get_settings
+from app.services.compositions import CompositionStats
+from app.services.features import (
+    PACKED_WIDTH,
+    selection_to_feature_vector,
+    selections_to_feature_matrix,
+)
+
+# Códigos de región de Riot: la1, na1, euw1, kr, ...
+REGION_PATTERN = re.compile(r"^[a-z0-9]{2,8}$")
+
+# Filas por bloque al predecir en masa
+BULK_CHUNK_ROWS = 10_000
+
+
+def _file_bytes(*paths: Path) -> int:
+    """Tamaño en disco de los artefactos, como aproximación barata de su memoria."""
+    return sum(p.stat().st_size for p in paths if p.exists())
+
+
+@dataclass
+class RegionModel:
+    """Modelo de una región cargado en memoria."""
+
+    region: str
+    model: Any
+    memory_bytes: int = 0
+
+
+@dataclass
+class RegionStats:
+    """Artefactos de estadísticas de una región (counters, runas, composiciones)."""
+
+    region: str
+    counters: Dict[str, Any] = field(default_factory=dict)
+    runes: Dict[str, Any] = field(default_factory=dict)
+    compositions: Optional[CompositionStats] = None
+    memory_bytes: int = 0
+
+
+class _LazyLRUCache:
+    """Caché LRU que carga cada clave fuera del lock global.
+
+    El lock global solo protege el diccionario (consultar, insertar, desalojar).
+    La carga se serializa por clave, así una región fría no bloquea a las
+    que ya están en memoria.
+    """
+
+    def __init__(self, max_size: int, loader: Callable[[str], Any], label: str) -> None:
+        self.max_size = max(1, max_size)
+        self.load_counts: Dict[str, int] = {}
+        self._loader = loader
+        self._label = label
+        self._items: "OrderedDict[str, Any]" = OrderedDict()
+        self._key_locks: Dict[str, threading.Lock] = {}
+        self._lock = threading.Lock()
+
+    def _lookup(self, key: str) -> Optional[Any]:
+        item = self._items.get(key)
+        if item is not None:
+            self._items.move_to_end(key)
+        return item
+
+    def get(self, key: str) -> Any:
+        with self._lock:
+            item = self._lookup(key)
+            if item is not None:
+                return item
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+
+        with key_lock:
+            # Otro hilo pudo terminar de cargarla mientras esperábamos
+            with self._lock:
+                item = self._lookup(key)
+                if item is not None:
+                    return item
+
+            try:
+                item = self._loader(key)
+            except Exception:
+                with self._lock:
+                    self._key_locks.pop(key, None)
+                raise
+
+            # Insertar y soltar el lock de la clave en el mismo paso: si no,
+            # otro hilo podría no verla en _items y cargarla de nuevo.
+            with self._lock:
+                self._items[key] = item
+                self.load_counts[key] = self.load_counts.get(key, 0) + 1
+                while len(self._items) > self.max_size:
+                    evicted, _ = self._items.popitem(last=False)
+                    print(f"{self._label} de la región '{evicted}' descargado de memoria (LRU)")
+                self._key_locks.pop(key, None)
+
+        return item
+
+    def snapshot(self) -> Tuple[Dict[str, int], Dict[str, Any]]:
+        """Copia de (load_counts, items) tomada bajo el lock."""
+        with self._lock:
+            return dict(self.load_counts), dict(self._items)
 
 
 class WinrateModelService:
-    """Servicio que encapsula la carga del modelo y la predicción."""
+    """Registro de modelos por región con carga perezosa y desalojo LRU.
+
+    Cada región se carga la primera vez que se usa. Como máximo se mantienen
+    `max_loaded_models` modelos en memoria; al superarlo se descarta el
+    usado hace más tiempo (se vuelve a cargar si se pide de nuevo).
+    Las estadísticas se guardan en una caché aparte, así consultarlas no
+    carga el modelo ni lo saca del LRU.
+    """
+
+    def __init__(self, settings: Optional[Settings] = None) -> None:
+        self.settings = settings or get_settings()
+        self.default_region = self.settings.riot_region.lower()
+        max_loaded = self.settings.max_loaded_models
+        self._models = _LazyLRUCache(max_loaded, self._load_region, "Modelo")
+        self._stats = _LazyLRUCache(max_loaded, self._load_region_stats, "Estadísticas")
+
+    @property
+    def model(self):
+        """Modelo de la región por defecto."""
+        return self.get_region().model
+
+    def get_region(self, region: Optional[str] = None) -> RegionModel:
+        """Devuelve el modelo de la región, cargándolo si no está en memoria."""
+        return self._models.get(self.normalize_region(region))
+
+    def get_stats(self, region: Optional[str] = None) -> RegionStats:
+        """Devuelve las estadísticas de la región sin cargar su modelo."""
+        return self._stats.get(self.normalize_region(region))
+
+    def registry_stats(self) -> List[Dict[str, Any]]:
+        """Estado del registro: cargas y memoria aproximada por región."""
+        model_counts, models = self._models.snapshot()
+        _, stats = self._stats.snapshot()
+        regions = sorted(set(model_counts) | set(stats))
+        return [
+            {
+                "region": region,
+                "loaded": region in models,
+                "load_count": model_counts.get(region, 0),
+                "memory_bytes": models[region].memory_bytes if region in models else 0,
+                "stats_loaded": region in stats,
+                "stats_memory_bytes": stats[region].memory_bytes if region in stats else 0,
+            }
+            for region in regions
+        ]
 
-    def __init__(self) -> None:
-        self.settings = get_settings()
-        self.model = self._load_or_create_dummy_model()
+    def normalize_region(self, region: Optional[str]) -> str:
+        """Región en minúsculas (o la de por defecto). ValueError si es inválida."""
+        region = (region or self.default_region).lower()
+        if not REGION_PATTERN.match(region):
+            raise ValueError(f"Región inválida: '{region}'")
+        return region
 
-    def _load_or_create_dummy_model(self):
+    def _load_region(self, region: str) -> RegionModel:
+        model_path = self.settings.model_path_for(region)
+
+        if region == self.default_region:
+            # Compatibilidad con el despliegue de una sola región
+            if not model_path.exists():
+                model_path = self.settings.model_path_for(None)
+            model = self._load_or_create_dummy_model(str(model_path))
+        elif model_path.exists():
+            model = load(model_path)
+        else:
+            raise FileNotFoundError(
+                f"No hay modelo entrenado para la región '{region}' en {model_path}"
+            )
+
+        if model_path.exists():
+            memory_bytes = _file_bytes(model_path)
+        else:
+            memory_bytes = model.coef_.nbytes + model.intercept_.nbytes
+
+        print(f"Modelo de la región '{region}' cargado")
+        return RegionModel(region=region, model=model, memory_bytes=memory_bytes)
+
+    def stats_dir(self, region: str) -> Path:
+        """Carpeta de estadísticas de la región ya normalizada.
+
+        La región por defecto usa data/processed si no tiene carpeta propia;
+        para el resto, FileNotFoundError si la carpeta no existe.
+        """
+        stats_dir = self.settings.stats_dir_for(region)
+        if region == self.default_region and not stats_dir.exists():
+            return self.settings.stats_dir_for(None)
+        if not stats_dir.exists():
+            # Sin esto, códigos de región inventados ocuparían el LRU
+            raise FileNotFoundError(
+                f"No hay estadísticas para la región '{region}' en {stats_dir}"
+            )
+        return stats_dir
+
+    def _load_region_stats(self, region: str) -> RegionStats:
+        stats_dir = self.stats_dir(region)
+
+        counters, runes = load_stats_artifacts(stats_dir)
+        compositions = load_composition_stats(stats_dir)
+        # El .npz está comprimido: para las composiciones se usan los contadores
+        memory_bytes = _file_bytes(
+            stats_dir / "champion_counters.json",
+            stats_dir / "champion_runes.json",
+        )
+        if compositions is not None:
+            memory_bytes += compositions.nbytes
+
+        return RegionStats(
+            region=region,
+            counters=counters,
+            runes=runes,
+            compositions=compositions,
+            memory_bytes=memory_bytes,
+        )
+
+    def _load_or_create_dummy_model(self, model_path: str):
         """Intenta cargar el modelo desde disco, si no existe crea uno dummy.
 
         El modelo dummy sirve solo para poder probar el flujo completo.
         Más adelante lo sobrescribes con tu modelo real desde scripts/train_model.py.
         """
-        model_path = self.settings.model_path
-
         if os.path.exists(model_path):
             return load(model_path)
 
         # Modelo dummy: entrena con datos aleatorios solo para tener algo funcional
         rng = np.random.default_rng(seed=42)
         n_samples = 200
-        n_features = 10  # 5 champs aliados + 5 enemigos
 
-        X = rng.integers(low=0, high=200, size=(n_samples, n_features))
+        # Misma codificación one-hot que en producción (5 aliados + 5 enemigos)
+        champions = rng.integers(low=1, high=200, size=(n_samples, PACKED_WIDTH))
+        X = selections_to_feature_matrix(champions)
         y = rng.integers(low=0, high=2, size=n_samples)
 
         model = LogisticRegression(max_iter=1000)
@@ -46,11 +257,73 @@ class WinrateModelService:
         self,
         team_champions: List[int],
         enemy_champions: List[int],
+        region: Optional[str] = None,
     ) -> float:
         """Devuelve la probabilidad de victoria del equipo (entre 0 y 1)."""
+        model = self.get_region(region).model
         features = selection_to_feature_vector(team_champions, enemy_champions)
         features = features.reshape(1, -1)
 
         # Asumimos que el modelo tiene predict_proba
-        proba = self.model.predict_proba(features)[0, 1]
+        proba = model.predict_proba(features)[0, 1]
         return float(proba)
+
+    def predict_winrate_batch(
+        self,
+        champions: np.ndarray,
+        region: Optional[str] = None,
+    ) -> np.ndarray:
+        """Predice en bloque para una matriz (N, 10) de IDs de campeones.
+
+        Devuelve un array float32 de tamaño N con la probabilidad de victoria
+        del equipo aliado en cada fila.
+        """
+        model = self.get_region(region).model
+        proba = np.empty(len(champions), dtype=np.float32)
+
+        # Por bloques: la matriz one-hot de cada bloque ocupa
+        # BULK_CHUNK_ROWS x MAX_CHAMP_ID bytes, no N x MAX_CHAMP_ID.
+        for start in range(0, len(champions), BULK_CHUNK_ROWS):
+            chunk = champions[start:start + BULK_CHUNK_ROWS]
+            features = selections_to_feature_matrix(chunk)
+            proba[start:start + len(chunk)] = model.predict_proba(features)[:, 1]
+
+        return proba
+
+
+def load_stats_artifacts(stats_dir: Path) -> Tuple[dict, dict]:
+    """Lee champion_counters.json y champion_runes.json si existen."""
+    counters = {}
+    runes = {}
+
+    try:
+        if (stats_dir / "champion_counters.json").exists():
+            with open(stats_dir / "champion_counters.json", "r") as f:
+                counters = json.load(f)
+
+        if (stats_dir / "champion_runes.json").exists():
+            with open(stats_dir / "champion_runes.json", "r") as f:
+                runes = json.load(f)
+    except Exception as e:
+        print(f"Error cargando stats: {e}")
+
+    return counters, runes
+
+
+def load_composition_stats(stats_dir: Path) -> Optional[CompositionStats]:
+    """Lee composition_sketch.npz si existe."""
+    sketch_path = stats_dir / "composition_sketch.npz"
+    if not sketch_path.exists():
+        return None
+
+    try:
+        return CompositionStats.load(sketch_path)
+    except Exception as e:
+        print(f"Error cargando composiciones: {e}")
+        return None
+
+
+@lru_cache
+def get_model_service() -> WinrateModelService:
+    """Devuelve el registro de modelos compartido por toda la app."""
+    return WinrateModelService()
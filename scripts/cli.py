@@ -0,0 +1,34 @@
+"""Argumentos de línea de comandos compartidos por los scripts del pipeline."""
+
+import argparse
+
+from app.services.model import REGION_PATTERN
+from scripts.profiling import add_profile_arguments
+
+DEFAULT_RAW_PATH = "data/raw/matches_raw.csv"
+
+
+def region_type(value: str) -> str:
+    region = value.lower()
+    if not REGION_PATTERN.match(region):
+        raise argparse.ArgumentTypeError(f"Región inválida: '{value}'")
+    return region
+
+
+def build_parser(script: str, description: str) -> argparse.ArgumentParser:
+    """Parser con --input, --region y los flags de perfilado."""
+    parser = argparse.ArgumentParser(prog=f"scripts.{script}", description=description)
+    parser.add_argument(
+        "--input",
+        default=DEFAULT_RAW_PATH,
+        help=f"CSV crudo de partidas (por defecto {DEFAULT_RAW_PATH}).",
+    )
+    parser.add_argument(
+        "--region",
+        type=region_type,
+        default=None,
+        help="Escribe los artefactos en REGION_MODEL_PATH / REGION_STATS_DIR "
+        "de esa región en lugar de MODEL_PATH / data/processed.",
+    )
+    add_profile_arguments(parser)
+    return parser
@@ -0,0 +1,174 @@
+"""Perfilado por etapas para los scripts de procesamiento y entrenamiento.
+
+Uso dentro de un script:
+
+    args = build_parser("train_model", "Entrena el modelo...").parse_args(argv)
+    profiler = profiler_from_args("train_model", settings.stats_dir_for(args.region), args)
+    with profiler.stage("read_csv") as stage:
+        df = pd.read_csv(raw_path)
+        stage.rows = len(df)
+    profiler.write_report()
+
+`build_parser` (scripts/cli.py) ya incluye los flags de perfilado; un parser
+propio puede agregarlos con `add_profile_arguments`.
+
+Se activa con `--profile` o con la variable de entorno PROFILE=true.
+Con `--profile-stage NOMBRE` (o PROFILE_STAGE) además se guarda un volcado
+cProfile (.prof) y un snapshot de tracemalloc (.tracemalloc) de esa etapa.
+
+Por cada etapa se registra:
+- wall_s: tiempo real transcurrido.
+- cpu_s: tiempo de CPU del proceso (todos los hilos).
+- peak_rss_mb: pico de memoria residente del proceso al terminar la etapa.
+- rss_growth_mb: cuánto subió ese pico durante la etapa.
+- rows: filas procesadas (si el script lo indica).
+"""
+
+from __future__ import annotations
+
+import argparse
+import cProfile
+import json
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Iterator, List, Optional
+
+from app.core.config import get_settings
+
+try:
+    import resource
+except ImportError:  # Windows no tiene el módulo resource
+    resource = None
+
+
+def _peak_rss_mb() -> Optional[float]:
+    """Pico de memoria residente del proceso en MB (None si no se puede medir)."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reporta KB, macOS reporta bytes
+    divisor = 1024 * 1024 if sys.platform == "darwin" else 1024
+    return round(peak / divisor, 2)
+
+
+@dataclass
+class StageRecord:
+    name: str
+    wall_s: float = 0.0
+    cpu_s: float = 0.0
+    peak_rss_mb: Optional[float] = None
+    rss_growth_mb: Optional[float] = None
+    rows: Optional[int] = None
+
+
+@dataclass
+class StageProfiler:
+    """Acumula métricas por etapa y las escribe como JSON junto a los artefactos."""
+
+    script: str
+    output_dir: Path
+    enabled: bool = False
+    snapshot_stage: Optional[str] = None
+    stages: List[StageRecord] = field(default_factory=list)
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[StageRecord]:
+        record = StageRecord(name=name)
+        if not self.enabled:
+            yield record
+            return
+
+        take_snapshot = name == self.snapshot_stage
+        profile = cProfile.Profile() if take_snapshot else None
+        if take_snapshot:
+            tracemalloc.start()
+            profile.enable()
+
+        rss_before = _peak_rss_mb()
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+        try:
+            yield record
+        finally:
+            record.wall_s = round(time.perf_counter() - wall_start, 4)
+            record.cpu_s = round(time.process_time() - cpu_start, 4)
+            record.peak_rss_mb = _peak_rss_mb()
+            if rss_before is not None:
+                record.rss_growth_mb = round(record.peak_rss_mb - rss_before, 2)
+
+            if take_snapshot:
+                profile.disable()
+                snapshot = tracemalloc.take_snapshot()
+                tracemalloc.stop()
+                self._dump_snapshot(name, profile, snapshot)
+
+            self.stages.append(record)
+            print(f"[profile] {name}: {record.wall_s:.2f}s wall, {record.cpu_s:.2f}s cpu")
+
+    def _dump_snapshot(
+        self,
+        name: str,
+        profile: cProfile.Profile,
+        snapshot: tracemalloc.Snapshot,
+    ) -> None:
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        base = self.output_dir / f"profile_{self.script}_{name}"
+        profile.dump_stats(f"{base}.prof")
+        snapshot.dump(f"{base}.tracemalloc")
+        print(f"[profile] Snapshot de '{name}' guardado en {base}.prof / .tracemalloc")
+
+    def write_report(self) -> Optional[Path]:
+        """Escribe profile_<script>.json. No hace nada si el perfilado está apagado."""
+        if not self.enabled:
+            return None
+
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        report_path = self.output_dir / f"profile_{self.script}.json"
+        report = {
+            "script": self.script,
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "total_wall_s": round(sum(s.wall_s for s in self.stages), 4),
+            "total_cpu_s": round(sum(s.cpu_s for s in self.stages), 4),
+            "stages": [asdict(s) for s in self.stages],
+        }
+        with open(report_path, "w") as f:
+            json.dump(report, f, indent=2)
+
+        print(f"[profile] Reporte guardado en {report_path}")
+        return report_path
+
+
+def add_profile_arguments(parser: argparse.ArgumentParser) -> None:
+    """Agrega --profile y --profile-stage a un parser existente."""
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Registra tiempo, CPU y memoria por etapa en un reporte JSON.",
+    )
+    parser.add_argument(
+        "--profile-stage",
+        default=None,
+        help="Etapa de la que guardar un volcado cProfile y tracemalloc.",
+    )
+
+
+def profiler_from_args(
+    script: str,
+    output_dir: Path,
+    args: argparse.Namespace,
+) -> StageProfiler:
+    """Crea el profiler a partir de los flags ya parseados y del .env."""
+    settings = get_settings()
+
+    snapshot_stage = args.profile_stage or settings.profile_stage
+    return StageProfiler(
+        script=script,
+        output_dir=output_dir,
+        enabled=args.profile or settings.profile or snapshot_stage is not None,
+        snapshot_stage=snapshot_stage,
+    )
@@ -1,5 +1,6 @@
 from pathlib import Path
 import json
+from typing import List, Optional
 import numpy as np
 import pandas as pd
 from joblib import dump
@@ -9,17 +10,27 @@ from sklearn.model_selection import train_test_split
 from app.core.config import get_settings
 from app.services.features import selection_to_feature_vector
 from app.services.analyzer import ChampionAnalyzer
+from scripts.cli import build_parser
+from scripts.profiling import profiler_from_args
 
-def main() -> None:
+def main(argv: Optional[List[str]] = None) -> None:
+    args = build_parser(
+        "train_model",
+        "Entrena el modelo de winrate y genera las estadísticas por campeón.",
+    ).parse_args(argv)
     settings = get_settings()
-    raw_path = Path("data/raw/matches_raw.csv")
+    raw_path = Path(args.input)
+    output_dir = settings.stats_dir_for(args.region)
+    profiler = profiler_from_args("train_model", output_dir, args)
     
     if not raw_path.exists():
         print(f"CSV no encontrado en {raw_path}. Ejecuta primero generate_raw_matches_csv.")
         return
 
     print(f"Leído datos desde: {raw_path}")
-    df = pd.read_csv(raw_path)
+    with profiler.stage("read_csv") as stage:
+        df = pd.read_csv(raw_path)
+        stage.rows = len(df)
 
     # --- PARTE 1: Machine Learning (Random Forest) ---
     print("\n--- Entrenando Random Forest (Esto puede tardar unos segundos) ---")
@@ -30,15 +41,17 @@ def main() -> None:
     # Preparamos los vectores (features)
     # Nota: Para datasets MUY grandes (millones), esto debería optimizarse con numpy puro,
     # pero para <500k funciona bien.
-    features_list = []
-    for _, row in df.iterrows():
-        team = [int(row[c]) for c in team_cols]
-        enemy = [int(row[c]) for c in enemy_cols]
-        feat = selection_to_feature_vector(team, enemy)
-        features_list.append(feat)
+    with profiler.stage("build_features") as stage:
+        features_list = []
+        for _, row in df.iterrows():
+            team = [int(row[c]) for c in team_cols]
+            enemy = [int(row[c]) for c in enemy_cols]
+            feat = selection_to_feature_vector(team, enemy)
+            features_list.append(feat)
 
-    X = np.vstack(features_list)
-    y = df["team_win"].values
+        X = np.vstack(features_list)
+        y = df["team_win"].values
+        stage.rows = len(X)
 
     X_train, X_test, y_train, y_test = train_test_split(
         X, y, test_size=0.2, random_state=42, stratify=y
@@ -49,33 +62,49 @@ def main() -> None:
     # n_jobs=-1: Usa todos los núcleos de tu CPU para ir rápido
     model = RandomForestClassifier(n_estimators=100, random_state=42, n_jobs=-1)
     
-    model.fit(X_train, y_train)
+    with profiler.stage("fit") as stage:
+        model.fit(X_train, y_train)
+        stage.rows = len(X_train)
     
-    acc = accuracy_score(y_test, model.predict(X_test))
+    with profiler.stage("evaluate") as stage:
+        acc = accuracy_score(y_test, model.predict(X_test))
+        stage.rows = len(X_test)
     print(f"Accuracy test: {acc:.3f}")
     
-    model_path = Path(settings.model_path)
+    model_path = settings.model_path_for(args.region)
     model_path.parent.mkdir(parents=True, exist_ok=True)
-    dump(model, model_path)
+    with profiler.stage("dump_model"):
+        dump(model, model_path)
     print(f"Modelo guardado en {model_path}")
 
     # --- PARTE 2: Análisis Estadístico ---
     print("\n--- Generando Estadísticas por Campeón ---")
     analyzer = ChampionAnalyzer(df)
     
-    matchup_stats = analyzer.process_matchups()
-    rune_stats = analyzer.process_runes()
+    with profiler.stage("process_matchups") as stage:
+        matchup_stats = analyzer.process_matchups()
+        stage.rows = len(df)
+    with profiler.stage("process_runes") as stage:
+        rune_stats = analyzer.process_runes()
+        stage.rows = len(df)
+    with profiler.stage("process_compositions") as stage:
+        composition_stats = analyzer.process_compositions()
+        stage.rows = len(df)
     
-    output_dir = Path("data/processed")
-    output_dir.mkdir(exist_ok=True)
+    output_dir.mkdir(parents=True, exist_ok=True)
     
-    with open(output_dir / "champion_counters.json", "w") as f:
-        json.dump(matchup_stats, f, indent=2)
-        
-    with open(output_dir / "champion_runes.json", "w") as f:
-        json.dump(rune_stats, f, indent=2)
+    with profiler.stage("dump_json"):
+        with open(output_dir / "champion_counters.json", "w") as f:
+            json.dump(matchup_stats, f, indent=2)
+            
+        with open(output_dir / "champion_runes.json", "w") as f:
+            json.dump(rune_stats, f, indent=2)
+
+    with profiler.stage("dump_compositions"):
+        composition_stats.save(output_dir / "composition_sketch.npz")
 
     print(f"Estadísticas JSON actualizadas en {output_dir}")
+    profiler.write_report()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
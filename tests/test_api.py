@@ -1,5 +1,7 @@
+import numpy as np
 from fastapi.testclient import TestClient
 
+from app.api.v1.predictions import model_service
 from app.main import app
 
 client = TestClient(app)
@@ -18,3 +20,99 @@ def test_predict_endpoint_ok():
 
     assert "winrate" in data
     assert 0.0 <= data["winrate"] <= 1.0
+
+
+def test_predict_bulk_endpoint_ok():
+    champions = np.array(
+        [
+            [1, 2, 3, 4, 5, 6, 7, 8, 9, 10],
+            [11, 12, 0, 0, 0, 13, 0, 0, 0, 0],
+        ],
+        dtype="<i2",
+    )
+
+    response = client.post(
+        "/api/v1/predict/bulk",
+        content=champions.tobytes(),
+        headers={"Content-Type": "application/octet-stream"},
+    )
+
+    assert response.status_code == 200
+    winrates = np.frombuffer(response.content, dtype="<f4")
+    assert winrates.shape == (2,)
+    assert np.all((winrates >= 0.0) & (winrates <= 1.0))
+
+
+def test_predict_unknown_region():
+    payload = {
+        "team_champions": [1, 2, 3, 4, 5],
+        "enemy_champions": [6, 7, 8, 9, 10],
+    }
+
+    response = client.post("/api/v1/predict", params={"region": "zz9"}, json=payload)
+
+    assert response.status_code == 404
+
+
+def test_models_endpoint_lists_loaded_regions():
+    client.post(
+        "/api/v1/predict",
+        json={"team_champions": [1], "enemy_champions": [2]},
+    )
+
+    response = client.get("/api/v1/models")
+
+    assert response.status_code == 200
+    assert any(entry["loaded"] for entry in response.json())
+
+
+def test_predict_bulk_rejects_too_many_rows():
+    max_rows = model_service.settings.max_bulk_rows
+    champions = np.ones((max_rows + 1, 10), dtype="<i2")
+
+    response = client.post(
+        "/api/v1/predict/bulk",
+        content=champions.tobytes(),
+        headers={"Content-Type": "application/octet-stream"},
+    )
+
+    assert response.status_code == 413
+
+
+def test_invalid_region_is_rejected_by_every_endpoint():
+    response = client.post(
+        "/api/v1/predict",
+        params={"region": "../x"},
+        json={"team_champions": [1], "enemy_champions": [2]},
+    )
+    assert response.status_code == 400
+
+    response = client.get(
+        "/api/v1/stats/compositions",
+        params=[("champions", 1), ("region", "../x")],
+    )
+    assert response.status_code == 400
+
+
+def test_champion_stats_unknown_region():
+    response = client.get("/api/v1/stats/champions", params={"region": "zz9"})
+
+    assert response.status_code == 404
+
+
+def test_champion_stats_reads_region_directory(tmp_path, monkeypatch):
+    region_dir = tmp_path / "na1"
+    region_dir.mkdir()
+    (region_dir / "stats_per_champion.csv").write_text(
+        "champion_id,games,wins,winrate\n266,10,6,0.6\n"
+    )
+    monkeypatch.setattr(
+        model_service.settings, "region_stats_dir", str(tmp_path / "{region}")
+    )
+
+    response = client.get("/api/v1/stats/champions", params={"region": "na1"})
+
+    assert response.status_code == 200
+    assert response.json() == [
+        {"champion_id": 266, "games": 10, "wins": 6, "winrate": 0.6}
+    ]
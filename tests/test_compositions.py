@@ -0,0 +1,85 @@
+from collections import Counter
+from itertools import combinations
+
+import numpy as np
+
+from app.services.compositions import CompositionStats, CountMinSketch
+
+
+def test_count_min_sketch_never_underestimates():
+    rng = np.random.default_rng(seed=1)
+    keys = rng.integers(0, 5_000, size=20_000)
+    sketch = CountMinSketch(width=1024, depth=4)
+    sketch.add(keys)
+
+    exact = Counter(keys.tolist())
+    unique = np.array(list(exact))
+    estimates = sketch.query(unique)
+    true_counts = np.array([exact[k] for k in unique.tolist()])
+
+    assert np.all(estimates >= true_counts)
+    # La cota ε·N se cumple para (casi) todas las claves
+    assert np.mean(estimates - true_counts <= sketch.error_bound) > 0.95
+
+
+def test_composition_stats_trios_and_team(tmp_path):
+    teams = np.array([[5, 4, 3, 2, 1], [1, 2, 3, 6, 7], [1, 2, 3, 4, 5]])
+    wins = np.array([1, 0, 1])
+    stats = CompositionStats(width=4096, depth=4)
+    stats.update(teams, wins)
+
+    stats.save(tmp_path / "sketch.npz")
+    loaded = CompositionStats.load(tmp_path / "sketch.npz")
+    result = loaded.query_team([1, 2, 3, 4, 5])
+
+    trios = {tuple(t["champions"]): t for t in result["trios"]}
+    assert len(trios) == len(list(combinations(range(5), 3)))
+    assert trios[(1, 2, 3)]["games"] == 3
+    assert trios[(1, 2, 3)]["wins"] == 2
+    assert result["team"]["games"] == 2
+    assert result["team"]["winrate"] == 100.0
+
+
+def test_trio_counts_are_exact_on_random_matches():
+    rng = np.random.default_rng(seed=2)
+    teams = np.array([rng.choice(np.arange(1, 170), 5, replace=False) for _ in range(3_000)])
+    wins = rng.integers(0, 2, size=len(teams))
+    stats = CompositionStats()
+    for start in range(0, len(teams), 1_000):
+        stats.update(teams[start:start + 1_000], wins[start:start + 1_000])
+
+    games, won = Counter(), Counter()
+    for team, win in zip(teams, wins):
+        for trio in combinations(sorted(team.tolist()), 3):
+            games[trio] += 1
+            won[trio] += int(win)
+
+    for team in teams[:20]:
+        for trio in stats.query_team(team.tolist())["trios"]:
+            key = tuple(trio["champions"])
+            assert trio["games"] == games[key]
+            assert trio["wins"] == won[key]
+
+
+def test_team_estimate_within_error_bound_is_not_reliable():
+    rng = np.random.default_rng(seed=3)
+    teams = np.array([rng.choice(np.arange(1, 170), 5, replace=False) for _ in range(5_000)])
+    stats = CompositionStats(width=64, depth=2)
+    stats.update(teams, np.ones(len(teams)))
+
+    # Equipo nunca visto: con width=64 todas las filas tienen colisiones
+    team = stats.query_team([165, 166, 167, 168, 169])["team"]
+
+    assert team["games"] > 0
+    assert team["reliable"] is False
+    assert team["winrate"] is None
+
+
+def test_teams_with_repeated_champions_are_ignored():
+    stats = CompositionStats(width=4096, depth=4)
+    stats.update(np.array([[1, 1, 2, 3, 4], [1, 2, 3, 5, 6]]), np.array([1, 0]))
+
+    trios = {tuple(t["champions"]): t for t in stats.query_team([1, 2, 3])["trios"]}
+
+    assert trios[(1, 2, 3)]["games"] == 1
+    assert trios[(1, 2, 3)]["wins"] == 0
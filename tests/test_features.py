@@ -1,4 +1,13 @@
-from app.services.features import selection_to_feature_vector
+import numpy as np
+import pytest
+
+from app.services.features import (
+    MAX_CHAMP_ID,
+    PACKED_DTYPE,
+    parse_packed_selections,
+    selection_to_feature_vector,
+    selections_to_feature_matrix,
+)
 
 
 def test_selection_to_feature_vector_length():
@@ -14,3 +23,27 @@ def test_selection_to_feature_vector_padding():
     vec = selection_to_feature_vector(team, enemy)
     # primeros valores: champ aliados (rellenos con 0)
     assert list(vec[:5]) == [1, 0, 0, 0, 0]
+
+
+def test_selections_to_feature_matrix_matches_single_row():
+    champions = np.array(
+        [
+            [1, 2, 3, 0, 0, 4, 5, 0, 0, 0],
+            [10, 20, 30, 40, 50, 60, 70, 80, 90, 100],
+        ],
+        dtype=PACKED_DTYPE,
+    )
+    matrix = selections_to_feature_matrix(champions)
+    assert matrix.shape == (2, MAX_CHAMP_ID)
+    for row, expected in zip(champions, matrix):
+        vec = selection_to_feature_vector(list(row[:5]), list(row[5:]))
+        assert np.array_equal(vec, expected)
+
+
+def test_parse_packed_selections_rejects_invalid_ids():
+    champions = np.array([[1, 2, 3, 4, 5, 6, 7, 8, 9, MAX_CHAMP_ID]], dtype=PACKED_DTYPE)
+    with pytest.raises(ValueError):
+        parse_packed_selections(champions.tobytes())
+
+    with pytest.raises(ValueError):
+        parse_packed_selections(b"\x01\x00\x02")
@@ -1,4 +1,14 @@
-from app.services.model import WinrateModelService
+import threading
+
+import numpy as np
+import pytest
+from joblib import dump
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.linear_model import LogisticRegression
+
+from app.core.config import Settings
+from app.services.features import selections_to_feature_matrix
+from app.services.model import WinrateModelService, _LazyLRUCache
 
 
 def test_model_predict_range():
@@ -8,3 +18,158 @@ def test_model_predict_range():
         [6, 7, 8, 9, 10],
     )
     assert 0.0 <= winrate <= 1.0
+
+
+def _write_region_models(tmp_path, regions):
+    rng = np.random.default_rng(seed=0)
+    champions = rng.integers(low=1, high=200, size=(50, 10))
+    X = selections_to_feature_matrix(champions)
+    y = rng.integers(low=0, high=2, size=50)
+    for region in regions:
+        path = tmp_path / region / "winrate_model.pkl"
+        path.parent.mkdir(parents=True)
+        dump(LogisticRegression(max_iter=200).fit(X, y), path)
+
+
+def test_registry_lazy_loading_and_lru_eviction(tmp_path):
+    _write_region_models(tmp_path, ["na1", "euw1", "kr"])
+    settings = Settings(
+        riot_region="na1",
+        region_model_path=str(tmp_path / "{region}" / "winrate_model.pkl"),
+        region_stats_dir=str(tmp_path / "{region}"),
+        max_loaded_models=2,
+    )
+    service = WinrateModelService(settings=settings)
+    assert service.registry_stats() == []
+
+    for region in ["na1", "euw1", "kr", "na1"]:
+        service.predict_winrate([1, 2], [3, 4], region=region)
+
+    stats = {entry["region"]: entry for entry in service.registry_stats()}
+    assert stats["na1"]["load_count"] == 2
+    assert stats["euw1"]["loaded"] is False
+    assert stats["kr"]["loaded"] and stats["kr"]["memory_bytes"] > 0
+
+    with pytest.raises(FileNotFoundError):
+        service.get_region("br1")
+    with pytest.raises(ValueError):
+        service.get_region("../etc")
+
+
+def test_registry_memory_bytes_is_model_file_size(tmp_path):
+    rng = np.random.default_rng(seed=0)
+    X = selections_to_feature_matrix(rng.integers(low=1, high=200, size=(200, 10)))
+    y = rng.integers(low=0, high=2, size=200)
+    path = tmp_path / "na1" / "winrate_model.pkl"
+    path.parent.mkdir(parents=True)
+    dump(RandomForestClassifier(n_estimators=10, random_state=0).fit(X, y), path)
+
+    settings = Settings(
+        riot_region="na1",
+        region_model_path=str(tmp_path / "{region}" / "winrate_model.pkl"),
+        region_stats_dir=str(tmp_path / "{region}"),
+    )
+    service = WinrateModelService(settings=settings)
+    service.get_region()
+
+    assert service.registry_stats()[0]["memory_bytes"] == path.stat().st_size
+
+
+def test_cold_load_does_not_block_loaded_regions():
+    release = threading.Event()
+    started = threading.Event()
+
+    def loader(key):
+        if key == "slow":
+            started.set()
+            release.wait(timeout=5)
+        return key.upper()
+
+    cache = _LazyLRUCache(max_size=2, loader=loader, label="Modelo")
+    assert cache.get("fast") == "FAST"
+
+    worker = threading.Thread(target=cache.get, args=("slow",))
+    worker.start()
+    started.wait(timeout=5)
+
+    # Mientras "slow" carga, la región ya cargada responde sin esperar
+    assert cache.get("fast") == "FAST"
+    assert not release.is_set()
+
+    release.set()
+    worker.join(timeout=5)
+    assert cache.get("slow") == "SLOW"
+    assert cache.load_counts == {"fast": 1, "slow": 1}
+
+
+def test_stats_do_not_load_model(tmp_path):
+    settings = Settings(
+        riot_region="na1",
+        region_model_path=str(tmp_path / "{region}" / "winrate_model.pkl"),
+        region_stats_dir=str(tmp_path / "{region}"),
+    )
+    service = WinrateModelService(settings=settings)
+
+    stats = service.get_stats()
+
+    assert stats.counters == {}
+    entry = service.registry_stats()[0]
+    assert entry["stats_loaded"] and not entry["loaded"]
+
+
+def test_predict_batch_in_chunks_matches_single_rows(monkeypatch):
+    monkeypatch.setattr("app.services.model.BULK_CHUNK_ROWS", 3)
+    service = WinrateModelService()
+    rng = np.random.default_rng(seed=1)
+    champions = rng.integers(low=1, high=200, size=(8, 10))
+
+    proba = service.predict_winrate_batch(champions)
+
+    assert proba.dtype == np.float32 and proba.shape == (8,)
+    for row, p in zip(champions, proba):
+        expected = service.predict_winrate(list(row[:5]), list(row[5:]))
+        assert abs(p - expected) < 1e-6
+
+
+def test_unknown_region_stats_do_not_evict_loaded_region(tmp_path):
+    (tmp_path / "na1").mkdir()
+    settings = Settings(
+        riot_region="na1",
+        region_model_path=str(tmp_path / "{region}" / "winrate_model.pkl"),
+        region_stats_dir=str(tmp_path / "{region}"),
+        max_loaded_models=1,
+    )
+    service = WinrateModelService(settings=settings)
+    service.get_stats()
+
+    for region in ["aa1", "bb2", "cc3"]:
+        with pytest.raises(FileNotFoundError):
+            service.get_stats(region)
+
+    stats = service.registry_stats()
+    assert [entry["region"] for entry in stats] == ["na1"]
+    assert stats[0]["stats_loaded"]
+
+
+def test_concurrent_cold_loads_load_once():
+    barrier = threading.Barrier(8)
+    calls = []
+
+    def loader(key):
+        calls.append(key)
+        return key.upper()
+
+    cache = _LazyLRUCache(max_size=2, loader=loader, label="Modelo")
+
+    def worker():
+        barrier.wait(timeout=5)
+        assert cache.get("na1") == "NA1"
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=5)
+
+    assert calls == ["na1"]
+    assert cache.load_counts == {"na1": 1}
@@ -0,0 +1,38 @@
+import argparse
+import json
+
+from scripts.profiling import StageProfiler, add_profile_arguments, profiler_from_args
+
+
+def test_stage_profiler_writes_report_and_snapshot(tmp_path):
+    profiler = StageProfiler(
+        script="demo",
+        output_dir=tmp_path,
+        enabled=True,
+        snapshot_stage="work",
+    )
+
+    with profiler.stage("work") as stage:
+        data = [i * i for i in range(10_000)]
+        stage.rows = len(data)
+
+    report_path = profiler.write_report()
+    report = json.loads(report_path.read_text())
+
+    assert report["stages"][0]["name"] == "work"
+    assert report["stages"][0]["rows"] == 10_000
+    assert report["stages"][0]["wall_s"] >= 0.0
+    assert (tmp_path / "profile_demo_work.prof").exists()
+    assert (tmp_path / "profile_demo_work.tracemalloc").exists()
+
+
+def test_profiler_disabled_by_default(tmp_path):
+    parser = argparse.ArgumentParser()
+    add_profile_arguments(parser)
+    profiler = profiler_from_args("demo", tmp_path, parser.parse_args([]))
+
+    with profiler.stage("work") as stage:
+        stage.rows = 1
+
+    assert profiler.write_report() is None
+    assert not any(tmp_path.iterdir())